@@ -1,3 +1,4 @@
+import hashlib
 import io
 import pandas as pd
 import streamlit as st
@@ -8,6 +9,48 @@ st.set_page_config(
     layout="centered"
 )
 
+# Characters Excel does not allow in worksheet names
+SHEET_NAME_TABLE = str.maketrans({ch: "_" for ch in '\\/*[]:?'})
+
+
+# Parsed uploads are shared across sessions, so keep only a few recent ones
+@st.cache_data(show_spinner=False, max_entries=4, ttl=1800)
+def load_excel(file_bytes):
+    try:
+        return pd.read_excel(io.BytesIO(file_bytes), dtype=object, engine="calamine")
+    except (ImportError, ValueError):
+        # python-calamine missing or pandas < 2.2: let pandas pick openpyxl / xlrd
+        return pd.read_excel(io.BytesIO(file_bytes), dtype=object)
+
+
+def brand_keys(df, brand_col):
+    return df[brand_col].fillna("Blank").astype("category")
+
+
+def build_workbook(df, brands, progress):
+    output = io.BytesIO()
+
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+
+        groups = df.groupby(brands, sort=True, observed=True)
+
+        total = len(groups)
+
+        for i, (brand, data) in enumerate(groups, start=1):
+
+            sheet_name = str(brand).translate(SHEET_NAME_TABLE)[:31]
+
+            data.to_excel(
+                writer,
+                sheet_name=sheet_name,
+                index=False
+            )
+
+            progress.progress(i / total)
+
+    return output.getvalue()
+
+
 st.title("📄 Brand Wise Worksheet Splitter")
 st.write("Upload an Excel file and split it into worksheets based on the **Brand** column.")
 
@@ -18,8 +61,10 @@ uploaded_file = st.file_uploader(
 
 if uploaded_file is not None:
 
+    file_bytes = uploaded_file.getvalue()
+
     with st.spinner("Reading Excel..."):
-        df = pd.read_excel(uploaded_file, dtype=object)
+        df = load_excel(file_bytes)
 
     # Find Brand column (case-insensitive)
     brand_col = None
@@ -34,47 +79,32 @@ if uploaded_file is not None:
 
     st.success(f"✅ Found Brand column: {brand_col}")
 
+    brands = brand_keys(df, brand_col)
+
     st.write(f"Rows : **{len(df):,}**")
-    st.write(f"Unique Brands : **{df[brand_col].fillna('Blank').nunique()}**")
+    st.write(f"Unique Brands : **{len(brands.cat.categories)}**")
 
     if st.button("Split Workbook"):
 
-        progress = st.progress(0)
-
-        output = io.BytesIO()
-
-        with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-
-            groups = df.groupby(df[brand_col].fillna("Blank"), sort=True)
-
-            total = len(groups)
-
-            for i, (brand, data) in enumerate(groups, start=1):
-
-                sheet_name = str(brand)
-
-                for ch in ['\\', '/', '*', '[', ']', ':', '?']:
-                    sheet_name = sheet_name.replace(ch, "_")
+        # Keep only this session's latest split, so repeat clicks reuse it
+        workbook_key = (hashlib.blake2b(file_bytes).hexdigest(), brand_col)
 
-                sheet_name = sheet_name[:31]
+        if st.session_state.get("workbook_key") != workbook_key:
 
-                data.to_excel(
-                    writer,
-                    sheet_name=sheet_name,
-                    index=False
-                )
+            progress = st.progress(0)
 
-                progress.progress(i / total)
+            st.session_state["workbook"] = build_workbook(df, brands, progress)
+            st.session_state["workbook_key"] = workbook_key
 
-        output.seek(0)
+            progress.empty()
 
-        progress.empty()
+        workbook = st.session_state["workbook"]
 
         st.success("✅ Workbook created successfully!")
 
         st.download_button(
             label="⬇ Download Workbook",
-            data=output,
+            data=workbook,
             file_name="Brand_Wise_Workbook.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )